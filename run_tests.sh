@@ -31,8 +31,24 @@ python3 test_coverage_segment_generator.py
 COVERAGE_GENERATOR_TEST_RESULT=$?
 cd ..
 
+# Test data generator
+echo ""
+echo "📦 Testing data generator..."
+cd tests
+python3 test_data_generator.py
+DATA_GENERATOR_TEST_RESULT=$?
+cd ..
+
+# Test error generator
+echo ""
+echo "⚠️ Testing error generator..."
+cd tests
+python3 test_error_generator.py
+ERROR_GENERATOR_TEST_RESULT=$?
+cd ..
+
 # Check results
-if [ $ENVELOPE_GENERATOR_TEST_RESULT -eq 0 ] && [ $MEMBER_GENERATOR_TEST_RESULT -eq 0 ] && [ $COVERAGE_GENERATOR_TEST_RESULT -eq 0 ]; then
+if [ $ENVELOPE_GENERATOR_TEST_RESULT -eq 0 ] && [ $MEMBER_GENERATOR_TEST_RESULT -eq 0 ] && [ $COVERAGE_GENERATOR_TEST_RESULT -eq 0 ] && [ $DATA_GENERATOR_TEST_RESULT -eq 0 ] && [ $ERROR_GENERATOR_TEST_RESULT -eq 0 ]; then
     echo ""
     echo "✅ All tests passed!"
     exit 0
@@ -5,17 +5,33 @@ Generates valid field values for EDI transactions based on YAML specifications.
 Uses flexible core generators: random_string, faker_based, datetime_past/future.
 """
 
-import faker
+import os
+import pickle
 import random
+import re
+import string
 import yaml
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 
+# Prefer the libyaml C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# YAML data directory, resolved once for every loader
+DATA_DIR = Path(__file__).parent.parent / "data"
+
 # Character sets cache - load once, use many times
 character_sets_cache = None
 
-# Initialize faker
-fake = faker.Faker()
+# On-disk cache of parsed YAML files - bump the version when the cached layout changes
+YAML_CACHE_DIR = DATA_DIR / ".cache"
+YAML_CACHE_VERSION = 1
+
+# Faker instance - created on first use since importing faker is slow
+fake = None
 
 # Insurance providers with proper EDI abbreviations (all under 15 characters)
 INSURANCE_PROVIDERS = [
@@ -32,6 +48,32 @@ INSURANCE_PROVIDERS = [
 # EDI delimiter characters that must never appear in field values
 EDI_DELIMITERS = "*~:>+^"
 
+# Translation table mapping every EDI delimiter to a space in one pass
+EDI_DELIMITER_TABLE = str.maketrans(EDI_DELIMITERS, " " * len(EDI_DELIMITERS))
+
+# Anything but letters, digits and whitespace - compiled once for validate_edi_field_value
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# Faker value pools - filled by the first draws, then sampled instead of calling faker
+FAKER_POOL_SIZE = 1000
+faker_pools = {}
+
+# Character sets whose full form includes EDI delimiters
+SAFE_CHARACTERSETS = {
+    "printable": "printable_safe",
+    "extended": "extended_safe",
+}
+
+def get_faker():
+    """Get the shared Faker instance, importing faker on first use."""
+    global fake
+    if fake is None:
+        import faker
+        fake = faker.Faker()
+        # Faker keeps its own RNG - seed it from random so random.seed() also fixes faker values
+        fake.seed_instance(random.getrandbits(64))
+    return fake
+
 def validate_edi_field_value(value):
     """
     Validate and format EDI field value: uppercase, remove punctuation, remove delimiters.
@@ -42,32 +84,76 @@ def validate_edi_field_value(value):
     Returns:
         str: The validated and formatted value
     """
-    import re
-    
     # Convert to uppercase
     value = value.upper()
     
     # Remove punctuation (keep only letters, numbers, and spaces)
-    value = re.sub(r'[^\w\s]', ' ', value)
+    value = PUNCTUATION_PATTERN.sub(' ', value)
     
     # Remove EDI delimiters
-    for delimiter in EDI_DELIMITERS:
-        value = value.replace(delimiter, ' ')
+    value = value.translate(EDI_DELIMITER_TABLE)
     
     # Clean up multiple spaces
     value = ' '.join(value.split())
     
     return value
 
+def load_yaml_file(yaml_path):
+    """
+    Load a YAML file, reusing a pickled copy while the file is unchanged.
+    
+    The pickle is keyed by the YAML file's modification time and size. Cache
+    problems never block a load: a missing, stale or unreadable pickle falls
+    back to parsing, and an unwritable cache directory is skipped.
+    
+    Args:
+        yaml_path: Path to the YAML file
+        
+    Returns:
+        Parsed YAML data
+    """
+    stat = yaml_path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size, YAML_CACHE_VERSION)
+    cache_path = YAML_CACHE_DIR / f"{yaml_path.name}.pkl"
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_signature, data = pickle.load(f)
+        if cached_signature == signature:
+            return data
+    except Exception:
+        # A corrupt pickle can raise almost anything from pickle.load - just reparse
+        pass
+    
+    with open(yaml_path, 'r') as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    
+    # Write to a temp file and rename so readers never see a partial pickle
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        YAML_CACHE_DIR.mkdir(exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            pickle.dump((signature, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except Exception:
+        # Don't leave a partial temp file behind
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+    
+    return data
+
 def load_character_sets():
     """Load and cache character sets from YAML file."""
     global character_sets_cache
     if character_sets_cache is None:
-        yaml_path = Path(__file__).parent.parent / "data" / "character_sets.yaml"
-        with open(yaml_path, 'r') as f:
-            character_sets_cache = yaml.safe_load(f)
+        character_sets_cache = load_yaml_file(DATA_DIR / "character_sets.yaml")
     return character_sets_cache
 
+# Bound once at import so generators skip the cache check on every call
+CHARACTER_SETS = load_character_sets()
+
 def random_string_generator(
     characterset="alphanumeric",
     min_length=1,
@@ -90,29 +176,26 @@ def random_string_generator(
     if valid_values:
         return random.choice(valid_values)
     
-    # Load character sets
-    character_sets = load_character_sets()
-    
-    # Convert to safe character set to avoid EDI delimiters
-    safe_characterset = convert_to_safe_characterset(characterset)
-    chars = character_sets.get(safe_characterset, character_sets["alphanumeric"])
+    # Resolve to the safe character set to avoid EDI delimiters
+    chars = ALLOWED_CHARS.get(characterset, ALLOWED_CHARS["alphanumeric"])
     
     # Generate random length within constraints
-    target_length = random.randint(min_length, max_length)
+    target_length = random.randrange(min_length, max_length + 1)
     
     # Generate random string
-    result = ''.join(random.choice(chars) for _ in range(target_length))
+    result = ''.join(random.choices(chars, k=target_length))
     
     # Validate and clean
     return validate_edi_field_value(result)
 
-def pick_valid_value(valid_values, weights=None):
+def pick_valid_value(valid_values, weights=None, cum_weights=None):
     """
     Pick a random valid value from a list.
     
     Args:
         valid_values: List of valid values to choose from
         weights: Optional list of weights for weighted selection
+        cum_weights: Optional precomputed cumulative weights (skips per-call accumulation)
         
     Returns:
         str: Random valid value from the list
@@ -120,7 +203,9 @@ def pick_valid_value(valid_values, weights=None):
     if not valid_values:
         return "N/A"
     
-    if weights:
+    if cum_weights:
+        return random.choices(valid_values, cum_weights=cum_weights)[0]
+    elif weights:
         return random.choices(valid_values, weights=weights)[0]
     else:
         return random.choice(valid_values)
@@ -128,6 +213,24 @@ def pick_valid_value(valid_values, weights=None):
 
 
 
+# Map field types to faker methods - built once, not per call
+FAKER_METHODS = {
+    "company_name": lambda: get_faker().company(),
+    "insurance_provider": lambda: random.choice(INSURANCE_PROVIDERS),
+    "first_name": lambda: get_faker().first_name(),
+    "last_name": lambda: get_faker().last_name(),
+    "address": lambda: get_faker().street_address(),
+    "phone_number": lambda: get_faker().phone_number(),
+    "email": lambda: get_faker().email(),
+    "city": lambda: get_faker().city(),
+    "state": lambda: get_faker().state_abbr(),
+    "zip_code": lambda: get_faker().zipcode(),
+    "ssn": lambda: get_faker().ssn().replace('-', ''),
+    "member_id": lambda: ''.join(random.choices(string.ascii_letters, k=2) + random.choices(string.digits, k=7)),
+    "group_number": lambda: 'GRP' + ''.join(random.choices(string.digits, k=4)),
+    "policy_number": lambda: 'POL' + ''.join(random.choices(string.digits, k=7)),
+}
+
 def random_faker_generator(
     field_type,
     min_length=1,
@@ -146,27 +249,9 @@ def random_faker_generator(
     Returns:
         str: Generated realistic data
     """
-    # Map field types to faker methods
-    faker_methods = {
-        "company_name": lambda: fake.company(),
-        "insurance_provider": lambda: random.choice(INSURANCE_PROVIDERS),
-        "first_name": lambda: fake.first_name(),
-        "last_name": lambda: fake.last_name(),
-        "address": lambda: fake.street_address(),
-        "phone_number": lambda: fake.phone_number(),
-        "email": lambda: fake.email(),
-        "city": lambda: fake.city(),
-        "state": lambda: fake.state_abbr(),
-        "zip_code": lambda: fake.zipcode(),
-        "ssn": lambda: fake.ssn().replace('-', ''),
-        "member_id": lambda: fake.bothify(text='??#######'),
-        "group_number": lambda: fake.bothify(text='GRP####'),
-        "policy_number": lambda: fake.bothify(text='POL#######'),
-    }
-    
     # Generate value using faker
-    if field_type in faker_methods:
-        value = faker_methods[field_type]()
+    if field_type in FAKER_METHODS:
+        value = FAKER_METHODS[field_type]()
     else:
         # Fallback to generic string generation
         return random_string_generator("alphanumeric", min_length, max_length)
@@ -183,6 +268,33 @@ def random_faker_generator(
     
     return value
 
+def pooled_faker_generator(
+    field_type,
+    min_length=1,
+    max_length=50
+):
+    """
+    Faker-based generator that reuses previously generated values.
+    
+    The first FAKER_POOL_SIZE calls per (field_type, min_length, max_length)
+    draw fresh values from faker and keep them; later calls pick from that
+    pool, skipping faker and field validation entirely.
+    
+    Args:
+        field_type: Type of faker data to generate
+        min_length: Minimum length constraint
+        max_length: Maximum length constraint
+        
+    Returns:
+        str: Generated realistic data
+    """
+    pool = faker_pools.setdefault((field_type, min_length, max_length), [])
+    if len(pool) < FAKER_POOL_SIZE:
+        value = random_faker_generator(field_type, min_length, max_length)
+        pool.append(value)
+        return value
+    return random.choice(pool)
+
 def random_past_date_generator(
     format_type="YYMMDD",
     days_back=365 * 5,
@@ -199,9 +311,8 @@ def random_past_date_generator(
     Returns:
         str: Formatted past date/time
     """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-    random_date = fake.date_between(start_date=start_date, end_date=end_date)
+    # Offset from today directly instead of building a start/end range for Faker
+    random_date = date.today() - timedelta(days=random.randrange(days_back + 1))
     
     return format_datetime(random_date, format_type)
 
@@ -221,9 +332,8 @@ def random_future_date_generator(
     Returns:
         str: Formatted future date/time
     """
-    start_date = datetime.now()
-    end_date = start_date + timedelta(days=days_forward)
-    random_date = fake.date_between(start_date=start_date, end_date=end_date)
+    # Offset from today directly instead of building a start/end range for Faker
+    random_date = date.today() + timedelta(days=random.randrange(days_forward + 1))
     
     return format_datetime(random_date, format_type)
 
@@ -242,21 +352,29 @@ def random_time_generator(
     Returns:
         str: Formatted time
     """
-    if format_type == "HHMM":
-        return fake.time(pattern="%H%M")
-    elif format_type == "HHMMSS":
-        return fake.time(pattern="%H%M%S")
+    # Split a random second of the day directly instead of formatting through Faker
+    hours, remainder = divmod(random.randrange(86400), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    
+    if format_type == "HHMMSS":
+        return f"{hours:02d}{minutes:02d}{seconds:02d}"
     else:
         # Default to HHMM
-        return fake.time(pattern="%H%M")
+        return f"{hours:02d}{minutes:02d}"
 
 def convert_to_safe_characterset(characterset):
     """Convert character set to safe version (removes EDI delimiters)."""
-    safe_mapping = {
-        "printable": "printable_safe",
-        "extended": "extended_safe",
-    }
-    return safe_mapping.get(characterset, characterset)
+    return SAFE_CHARACTERSETS.get(characterset, characterset)
+
+# Characters each character set resolves to, built once so generators index directly
+ALLOWED_CHARS = {
+    name: CHARACTER_SETS[convert_to_safe_characterset(name)]
+    for name in CHARACTER_SETS if not name.endswith("_unsafe")
+}
+UNSAFE_CHARS = {
+    name: CHARACTER_SETS.get(f"{name}_unsafe", "")
+    for name in ALLOWED_CHARS
+}
 
 def format_datetime(date_obj, format_type):
     """Format datetime object according to specified format."""
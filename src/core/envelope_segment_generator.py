@@ -5,24 +5,19 @@ Generates envelope/structural segments and their field generators for EDI 834 tr
 Handles all structural segments: ISA, IEA, GS, GE, ST, SE, BGN.
 """
 
-from .error_generator import load_field_specs, is_error_in_field, blank_value_generator, missing_value_generator, invalid_value_generator, invalid_character_generator, invalid_length_generator, all_zeros_generator
+from .error_generator import FIELD_SPECS, is_error_in_field, FIELD_ERROR_GENERATORS
 from .data_generator import (
-    random_string_generator, random_faker_generator, 
+    pooled_faker_generator,
     random_past_date_generator, random_future_date_generator, 
-    random_time_generator, pick_valid_value,
-    load_character_sets, convert_to_safe_characterset
+    random_time_generator, pick_valid_value
 )
 import random
-import yaml
-from pathlib import Path
+from itertools import accumulate
 
 # Weight constants for valid value selection
 MOST_COMMON_WEIGHT = 0.9
 LESS_COMMON_WEIGHT = 0.05
 
-# YAML cache - load once, use many times
-field_specs_cache = None
-
 def apply_field_error(field_designation, field_spec, valid_value, error_info=None):
     """
     Apply error to a field based on its YAML error scenarios.
@@ -31,68 +26,42 @@ def apply_field_error(field_designation, field_spec, valid_value, error_info=Non
         error_info: Shared state dict - gets updated with error details (error_type, error_value, error_explanation)
                    Returns just the error value, not the full dict.
     """
-    error_scenarios = field_spec.get("error_scenarios", ["missing_value"])
+    error_scenarios = field_spec["error_scenarios"]
     error_type = random.choice(error_scenarios)
     
     # Call the right error generator - they update error_info directly
-    if error_type == "blank_value":
-        return blank_value_generator(field_designation, field_spec, valid_value, error_info)
-    elif error_type == "missing_value":
-        return missing_value_generator(field_designation, field_spec, valid_value, error_info)
-    elif error_type == "invalid_value":
-        return invalid_value_generator(field_designation, field_spec, valid_value, error_info)
-    elif error_type == "invalid_character":
-        return invalid_character_generator(field_designation, field_spec, valid_value, error_info)
-    elif error_type == "invalid_length":
-        return invalid_length_generator(field_designation, field_spec, valid_value, error_info)
-    elif error_type == "all_zeros":
-        return all_zeros_generator(field_designation, field_spec, valid_value, error_info)
-    elif error_type == "mismatch_control_number":
-        # Fallback case - update error_info here
-        if error_info is not None:
-            error_info["error_type"] = "mismatch_control_number"
-            error_info["error_value"] = "999999999"
-            error_info["error_explanation"] = "Control number mismatch (TODO: implement this structural error)"
-        return "999999999"
-    elif error_type in ["invalid_date", "invalid_time"]:
-        # Fallback case - update error_info here
-        if error_info is not None:
-            error_info["error_type"] = error_type
-            error_info["error_value"] = "N/A"
-            error_info["error_explanation"] = f"TODO: Implement {error_type} error generator"
-        return "N/A"
-    else:
-        # Fallback case - update error_info here
-        if error_info is not None:
-            error_info["error_type"] = "unknown"
-            error_info["error_value"] = "N/A"
-            error_info["error_explanation"] = "Unknown error type (fallback)"
-        return "N/A"
-
-def load_field_specs():
-    """Load and cache all field specifications from all YAML files."""
-    global field_specs_cache
-    if field_specs_cache is None:
-        field_specs_cache = {}
-        
-        # Load from all YAML files
-        yaml_files = [
-            "envelope_segment_specifications.yaml",
-            "member_segment_specifications.yaml", 
-            "coverage_segment_specifications.yaml"
-        ]
-        
-        for yaml_file in yaml_files:
-            yaml_path = Path(__file__).parent.parent / "data" / yaml_file
-            if yaml_path.exists():
-                with open(yaml_path, 'r') as f:
-                    raw_yaml = yaml.safe_load(f)
-                # Parse and merge into single cache
-                from .error_generator import parse_segment_specs
-                parsed_specs = parse_segment_specs(raw_yaml)
-                field_specs_cache.update(parsed_specs)
-    
-    return field_specs_cache
+    generator = FIELD_ERROR_GENERATORS.get(error_type)
+    if generator:
+        return generator(field_designation, field_spec, valid_value, error_info)
+    
+    # Fallback for types with no generator yet (e.g. invalid_date, invalid_time) - keep the drawn type
+    if error_info is not None:
+        error_info.update({
+            "error_type": error_type,
+            "error_value": "N/A",
+            "error_explanation": f"Error type '{error_type}' not implemented for {field_designation}"
+        })
+    return "N/A"
+
+def favoured_cum_weights(field_designation, favoured_value, favoured_weight=MOST_COMMON_WEIGHT, other_weight=LESS_COMMON_WEIGHT):
+    """Cumulative weights over an ISA field's valid values favouring one value, or None if it is not valid."""
+    valid_values = FIELD_SPECS["ISA"]["fields"][field_designation]["valid_values"]
+    if favoured_value not in valid_values:
+        return None
+    return tuple(accumulate(favoured_weight if val == favoured_value else other_weight for val in valid_values))
+
+# Valid value weights per field, accumulated once instead of on every call
+VALID_VALUE_CUM_WEIGHTS = {
+    "ISA01": favoured_cum_weights("ISA01", "00"),
+    "ISA03": favoured_cum_weights("ISA03", "00"),
+    "ISA05": favoured_cum_weights("ISA05", "ZZ"),
+    "ISA07": favoured_cum_weights("ISA07", "ZZ"),
+    "ISA11": favoured_cum_weights("ISA11", "^"),
+    "ISA12": favoured_cum_weights("ISA12", "00501"),
+    "ISA14": favoured_cum_weights("ISA14", "0", 0.9, 0.1),
+    "ISA15": favoured_cum_weights("ISA15", "T", 0.9, 0.1),
+    "ISA16": favoured_cum_weights("ISA16", ":"),
+}
 
 #=============================================================================
 # ISA SEGMENT
@@ -102,15 +71,9 @@ def load_field_specs():
 def generate_authorization_qualifier(error_target=None, error_info=None):
     """Generate ISA01 - Authorization Information Qualifier"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA01"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA01"]
     # "00" most common authorization qualifier
-    if "00" in valid_values:
-        weights = [MOST_COMMON_WEIGHT if val == "00" else LESS_COMMON_WEIGHT for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA01"])
     
     # Check if this field is the error target
     if error_target == "ISA01":
@@ -125,15 +88,9 @@ def generate_authorization_info():
 def generate_security_qualifier(error_target=None, error_info=None):
     """Generate ISA03 - Security Information Qualifier"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA03"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA03"]
     # "00" most common security qualifier
-    if "00" in valid_values:
-        weights = [MOST_COMMON_WEIGHT if val == "00" else LESS_COMMON_WEIGHT for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA03"])
     
     # Check if this field is the error target
     if error_target == "ISA03":
@@ -148,15 +105,9 @@ def generate_security_info():
 def generate_sender_qualifier(error_target=None, error_info=None):
     """Generate ISA05 - Interchange ID Qualifier (Sender)"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA05"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA05"]
     # "ZZ" most common sender qualifier 
-    if "ZZ" in valid_values:
-        weights = [MOST_COMMON_WEIGHT if val == "ZZ" else LESS_COMMON_WEIGHT for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA05"])
     
     # Check if this field is the error target
     if error_target == "ISA05":
@@ -167,12 +118,11 @@ def generate_sender_qualifier(error_target=None, error_info=None):
 def generate_sender_id(error_target=None, error_info=None):
     """Generate ISA06 - Interchange Sender ID"""
     # Generate valid value first
-    valid_value = random_faker_generator("company_name", 15, 15)
+    valid_value = pooled_faker_generator("company_name", 15, 15)
     
     # Check if this field is the error target
     if error_target == "ISA06":
-        field_specs = load_field_specs()
-        field_spec = field_specs["ISA"]["fields"]["ISA06"]
+        field_spec = FIELD_SPECS["ISA"]["fields"]["ISA06"]
         return apply_field_error("ISA06", field_spec, valid_value, error_info)
     
     return valid_value
@@ -180,15 +130,9 @@ def generate_sender_id(error_target=None, error_info=None):
 def generate_receiver_qualifier(error_target=None, error_info=None):
     """Generate ISA07 - Interchange ID Qualifier (Receiver)"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA07"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA07"]
     # "ZZ" most common receiver qualifier
-    if "ZZ" in valid_values:
-        weights = [MOST_COMMON_WEIGHT if val == "ZZ" else LESS_COMMON_WEIGHT for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA07"])
     
     # Check if this field is the error target
     if error_target == "ISA07":
@@ -199,12 +143,11 @@ def generate_receiver_qualifier(error_target=None, error_info=None):
 def generate_receiver_id(error_target=None, error_info=None):
     """Generate ISA08 - Interchange Receiver ID"""
     # Generate valid value first
-    valid_value = random_faker_generator("insurance_provider", 15, 15)
+    valid_value = pooled_faker_generator("insurance_provider", 15, 15)
     
     # Check if this field is the error target
     if error_target == "ISA08":
-        field_specs = load_field_specs()
-        field_spec = field_specs["ISA"]["fields"]["ISA08"]
+        field_spec = FIELD_SPECS["ISA"]["fields"]["ISA08"]
         return apply_field_error("ISA08", field_spec, valid_value, error_info)
     
     return valid_value
@@ -216,8 +159,7 @@ def generate_interchange_date(error_target=None, error_info=None):
     
     # Check if this field is the error target
     if error_target == "ISA09":
-        field_specs = load_field_specs()
-        field_spec = field_specs["ISA"]["fields"]["ISA09"]
+        field_spec = FIELD_SPECS["ISA"]["fields"]["ISA09"]
         return apply_field_error("ISA09", field_spec, valid_value, error_info)
     
     return valid_value
@@ -229,8 +171,7 @@ def generate_interchange_time(error_target=None, error_info=None):
     
     # Check if this field is the error target
     if error_target == "ISA10":
-        field_specs = load_field_specs()
-        field_spec = field_specs["ISA"]["fields"]["ISA10"]
+        field_spec = FIELD_SPECS["ISA"]["fields"]["ISA10"]
         return apply_field_error("ISA10", field_spec, valid_value, error_info)
     
     return valid_value
@@ -238,15 +179,9 @@ def generate_interchange_time(error_target=None, error_info=None):
 def generate_repetition_separator(error_target=None, error_info=None):
     """Generate ISA11 - Repetition Separator"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA11"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA11"]
     # "^" most common repetition separator
-    if "^" in valid_values:
-        weights = [MOST_COMMON_WEIGHT if val == "^" else LESS_COMMON_WEIGHT for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA11"])
     
     # Check if this field is the error target
     if error_target == "ISA11":
@@ -257,15 +192,9 @@ def generate_repetition_separator(error_target=None, error_info=None):
 def generate_version_number(error_target=None, error_info=None):
     """Generate ISA12 - Interchange Version Number"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA12"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA12"]
     # "00501" most common version number
-    if "00501" in valid_values:
-        weights = [MOST_COMMON_WEIGHT if val == "00501" else LESS_COMMON_WEIGHT for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA12"])
     
     # Check if this field is the error target
     if error_target == "ISA12":
@@ -276,15 +205,9 @@ def generate_version_number(error_target=None, error_info=None):
 def generate_acknowledgment_requested(error_target=None, error_info=None):
     """Generate ISA14 - Acknowledgment Requested"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA14"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA14"]
     # "0" most common acknowledgment request
-    if "0" in valid_values:
-        weights = [0.9 if val == "0" else 0.1 for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA14"])
     
     # Check if this field is the error target
     if error_target == "ISA14":
@@ -295,15 +218,9 @@ def generate_acknowledgment_requested(error_target=None, error_info=None):
 def generate_usage_indicator(error_target=None, error_info=None):
     """Generate ISA15 - Usage Indicator"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA15"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA15"]
     # "P" is most common usage indicator but we prefer "T" for safety
-    if "T" in valid_values:
-        weights = [0.9 if val == "T" else 0.1 for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA15"])
     
     # Check if this field is the error target
     if error_target == "ISA15":
@@ -314,15 +231,9 @@ def generate_usage_indicator(error_target=None, error_info=None):
 def generate_component_separator(error_target=None, error_info=None):
     """Generate ISA16 - Component Element Separator"""
     # Generate valid value first
-    field_specs = load_field_specs()
-    field_spec = field_specs["ISA"]["fields"]["ISA16"]
-    valid_values = field_spec.get("valid_values", [])
+    field_spec = FIELD_SPECS["ISA"]["fields"]["ISA16"]
     # ":" most common component separator
-    if ":" in valid_values:
-        weights = [MOST_COMMON_WEIGHT if val == ":" else LESS_COMMON_WEIGHT for val in valid_values]
-        valid_value = pick_valid_value(valid_values, weights)
-    else:
-        valid_value = pick_valid_value(valid_values)
+    valid_value = pick_valid_value(field_spec["valid_values"], cum_weights=VALID_VALUE_CUM_WEIGHTS["ISA16"])
     
     # Check if this field is the error target
     if error_target == "ISA16":
@@ -336,13 +247,12 @@ def generate_control_number():
     # Most control numbers are small numbers with leading zeros 
     if random.random() < 0.7:
         # Generate 1-6 significant digits, pad with leading zeros
-        significant_digits = random.randint(1, 6)
-        max_value = 10 ** significant_digits - 1
-        number = random.randint(1, max_value)
+        significant_digits = random.randrange(1, 7)
+        number = random.randrange(1, 10 ** significant_digits)
         return f"{number:09d}"  # Pad to 9 digits with leading zeros
     else:
         # Generate full 9-digit control number which is less common in the wild
-        return random_string_generator("numeric", 9, 9)
+        return f"{random.randrange(1_000_000_000):09d}"
 
 # ISA Segment Generator
 def generate_isa_segment(with_errors=False, error_info=None, control_number=None):
@@ -398,8 +308,7 @@ def generate_group_count(error_target=None, error_info=None):
     
     # Check if this field is the error target
     if error_target == "IEA01":
-        field_specs = load_field_specs()
-        field_spec = field_specs["IEA"]["fields"]["IEA01"]
+        field_spec = FIELD_SPECS["IEA"]["fields"]["IEA01"]
         return apply_field_error("IEA01", field_spec, valid_value, error_info)
     
     return valid_value
@@ -411,8 +320,7 @@ def generate_iea_control_number(control_number, error_target=None, error_info=No
     
     # Check if this field is the error target
     if error_target == "IEA02":
-        field_specs = load_field_specs()
-        field_spec = field_specs["IEA"]["fields"]["IEA02"]
+        field_spec = FIELD_SPECS["IEA"]["fields"]["IEA02"]
         return apply_field_error("IEA02", field_spec, valid_value, error_info)
     
     return valid_value
@@ -449,21 +357,27 @@ def generate_iea_segment(with_errors=False, error_info=None, control_number=None
 # OTHER SEGMENTS (STUBBED)
 #=============================================================================
 
+# Static segments - replace with templated generators when these become dynamic
+GS_SEGMENT = "GS*BE*SENDER*RECEIVER*20250915*1010*1*X*005010X220A1~"
+GE_SEGMENT = "GE*1*1~"
+ST_SEGMENT = "ST*834*0001*005010X220A1~"
+SE_SEGMENT = "SE*13*0001~"
+
 def generate_gs_segment(error_info=None):
     """Generate GS segment - Functional Group Header"""
-    return "GS*BE*SENDER*RECEIVER*20250915*1010*1*X*005010X220A1~"
+    return GS_SEGMENT
 
 def generate_ge_segment(error_info=None):
     """Generate GE segment - Functional Group Trailer"""
-    return "GE*1*1~"
+    return GE_SEGMENT
 
 def generate_st_segment(error_info=None):
     """Generate ST segment - Transaction Set Header"""
-    return "ST*834*0001*005010X220A1~"
+    return ST_SEGMENT
 
 def generate_se_segment(error_info=None):
     """Generate SE segment - Transaction Set Trailer"""
-    return "SE*13*0001~"
+    return SE_SEGMENT
 
 # BGN segment moved to header_segment_generator.py
 
@@ -474,10 +388,10 @@ def generate_envelope_data(error_info=None):
     
     return {
         "isa": [generate_isa_segment(with_errors=False, error_info=error_info, control_number=control_number)],
-        "gs": [generate_gs_segment(error_info)],
-        "st": [generate_st_segment(error_info)],
-        "se": [generate_se_segment(error_info)],
-        "ge": [generate_ge_segment(error_info)],
+        "gs": [GS_SEGMENT],
+        "st": [ST_SEGMENT],
+        "se": [SE_SEGMENT],
+        "ge": [GE_SEGMENT],
         "iea": [generate_iea_segment(with_errors=False, error_info=error_info, control_number=control_number)]
         # BGN moved to header_segment_generator.py
     }
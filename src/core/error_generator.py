@@ -15,10 +15,10 @@ Field-level errors:
   invalid day, future date, and includes separators
 - invalid_time: Time format errors (wrong length, wrong format, invalid hour, invalidminute)
 - all_zeros: Field contains all zeros (common error for numeric fields)
+- incorrect_control_number: Control number doesn't match its paired control number (IEA02 vs ISA13)
 
 Structural errors (future implementation):
 - incorrect_group_count: Group count field doesn't match actual count
-- incorrect_control_number: Control number doesn't match expected value
 - incorrect_date: Date inconsistencies between related fields
 - incorrect_time: Time inconsistencies between related fields
 - missing_envelope: Required envelope is missing
@@ -53,7 +53,6 @@ FIELD-LEVEL ERRORS:
 
 STRUCTURAL ERRORS (ISA/IEA specific):
 - incorrect_count_generator: IEA01 count doesn't match actual functional group count
-- incorrect_control_number_generator: IEA02 control number doesn't match ISA13
 - incorrect_date_generator: ISA09 date doesn't match transaction date (structural error)
 - incorrect_time_generator: ISA10 time doesn't match transaction time (structural error)
 - missing_terminator_generator: Remove segment terminator (~) from ISA/IEA
@@ -75,21 +74,23 @@ NOTE: Finally, a valid argument against the Oxford comma! Can you see why?
 """
 
 import random
-import yaml
-from pathlib import Path
+from itertools import product
+from .data_generator import DATA_DIR, load_yaml_file, ALLOWED_CHARS, UNSAFE_CHARS
 
-# YAML caches - load once, use many times
+# YAML cache - load once, use many times
 field_specs_cache = None
-character_sets_cache = None
 
-def load_character_sets():
-    """Load and cache character sets from YAML file."""
-    global character_sets_cache
-    if character_sets_cache is None:
-        yaml_path = Path(__file__).parent.parent / "data" / "character_sets.yaml"
-        with open(yaml_path, 'r') as f:
-            character_sets_cache = yaml.safe_load(f)
-    return character_sets_cache
+# Semantic error weight -> numeric error rate
+ERROR_WEIGHT_RATES = {
+    "very_common": 0.3,  # 30% chance of error
+    "common": 0.1,       # 10% chance of error
+    "rare": 0.02,        # 2% chance of error
+    "never": 0.0         # 0% chance of error
+}
+
+# Number of invalid characters to inject - 80% one, 15% two, 5% three
+UNSAFE_COUNTS = (1, 2, 3)
+UNSAFE_COUNT_CUM_WEIGHTS = (80, 95, 100)
 
 def load_field_specs():
     """Load and cache all field specifications from all YAML files."""
@@ -105,10 +106,9 @@ def load_field_specs():
         ]
         
         for yaml_file in yaml_files:
-            yaml_path = Path(__file__).parent.parent / "data" / yaml_file
+            yaml_path = DATA_DIR / yaml_file
             if yaml_path.exists():
-                with open(yaml_path, 'r') as f:
-                    raw_yaml = yaml.safe_load(f)
+                raw_yaml = load_yaml_file(yaml_path)
                 # Parse and merge into single cache
                 parsed_specs = parse_segment_specs(raw_yaml)
                 field_specs_cache.update(parsed_specs)
@@ -135,22 +135,29 @@ def parse_segment_specs(raw_yaml):
             segment_name = field_id[:3]  # e.g., "ISA01" -> "ISA"
             
             if segment_name in parsed_specs:
+                characterset = field_data.get('characterset', '')
+                valid_values = field_data.get('valid_values', [])
+                error_weight = field_data.get('error_weight', 'rare')
                 parsed_specs[segment_name]['fields'][field_id] = {
                     'name': field_data.get('name', ''),
                     'purpose': field_data.get('purpose', ''),
                     'rules': field_data.get('rules', ''),
-                    'characterset': field_data.get('characterset', ''),
-                    'valid_values': field_data.get('valid_values', []),
+                    'characterset': characterset,
+                    'valid_values': valid_values,
                     'examples': field_data.get('examples', ''),
                     'min_length': field_data.get('min_length', 0),
                     'max_length': field_data.get('max_length', 0),
                     'field_type': field_data.get('field_type', 'generic'),
                     'common_errors': field_data.get('common_errors', []),
                     'error_scenarios': field_data.get('error_scenarios', []),
-                    'error_weight': field_data.get('error_weight', 'rare'),
+                    'error_weight': error_weight,
                     'required': field_data.get('required', False),
                     'position': field_data.get('position', 0),
-                    'default': field_data.get('default', '')
+                    'default': field_data.get('default', ''),
+                    # Derived once here so error generators skip per-call lookups and formatting
+                    'allowed_chars': get_allowed_chars(characterset),
+                    'unsafe_chars': get_unsafe_chars(characterset),
+                    'valid_list': smart_join(valid_values)
                 }
     
     return parsed_specs
@@ -158,16 +165,18 @@ def parse_segment_specs(raw_yaml):
 # Field-level error generators
 def blank_value_generator(field_designation, field_spec, valid_value, error_info=None):
     """Generate blank value error meaning spaces with required length."""
-    min_length = field_spec.get("min_length", 1)
-    max_length = field_spec.get("max_length", min_length)
-    target_length = random.randint(min_length, max_length)
+    min_length = field_spec["min_length"]
+    max_length = field_spec["max_length"]
+    target_length = random_length(min_length, max_length)
     blank_value = " " * target_length
     
     # Update error_info if provided
     if error_info is not None:
-        error_info["error_type"] = "blank_value"
-        error_info["error_value"] = blank_value
-        error_info["error_explanation"] = f"{field_designation} is blank with spaces only"
+        error_info.update({
+            "error_type": "blank_value",
+            "error_value": blank_value,
+            "error_explanation": f"{field_designation} is blank with spaces only"
+        })
     
     return blank_value
     
@@ -175,34 +184,31 @@ def missing_value_generator(field_designation, field_spec, valid_value, error_in
     """Generate missing value error (empty string)."""
     # Update error_info if provided
     if error_info is not None:
-        error_info["error_type"] = "missing_value"
-        error_info["error_value"] = ""
-        error_info["error_explanation"] = f"{field_designation} is missing"
+        error_info.update({
+            "error_type": "missing_value",
+            "error_value": "",
+            "error_explanation": f"{field_designation} is missing"
+        })
     
     return ""
     
 def invalid_value_generator(field_designation, field_spec, valid_value, error_info=None):
     """Generate invalid value error (value not in valid_values list)."""
-    common_errors = field_spec.get("common_errors", [])
-    valid_values = field_spec.get("valid_values", [])
+    common_errors = field_spec["common_errors"]
+    valid_values = field_spec["valid_values"]
     
     # Use common_errors if available
     if common_errors:
         invalid_value = random.choice(common_errors)
     # Generate random value that's not in valid_values
     elif valid_values:
-        characterset = field_spec.get("characterset", "alphanumeric")
-        min_length = field_spec.get("min_length", 1)
-        max_length = field_spec.get("max_length", min_length)
+        min_length = field_spec["min_length"]
+        max_length = field_spec["max_length"]
+        allowed_chars = field_spec["allowed_chars"]
         
-        # Try to generate invalid value (limited attempts)
-        max_attempts = 10
-        for attempt in range(max_attempts):
-            invalid_value = random_string_generator(characterset, min_length, max_length)
-            if invalid_value not in valid_values:
-                break
-        else:
-            # If we couldn't find a valid invalid value, use fallback
+        invalid_value = random_string_excluding(allowed_chars, min_length, max_length, valid_values)
+        if invalid_value is None:
+            # Every character is valid at every position, use fallback
             invalid_value = "N/A"
     # Fallback protection
     else:
@@ -210,78 +216,69 @@ def invalid_value_generator(field_designation, field_spec, valid_value, error_in
         
     # Update error_info if provided
     if error_info is not None:
-        error_info["error_type"] = "invalid_value"
-        error_info["error_value"] = str(invalid_value)
         # Show valid values with elegant formatting using smart join
-        def smart_join(items, final_joiner=" or "):
-            """Join items with commas, using final_joiner before the last item."""
-            if len(items) <= 1:
-                return "".join(f"'{item}'" for item in items)
-            return ", ".join(f"'{item}'" for item in items[:-1]) + f"{final_joiner}'{items[-1]}'"
+        valid_list = field_spec["valid_list"]
         
-        valid_list = smart_join(valid_values)
-        
-        error_info["error_explanation"] = f"{field_designation} contains invalid value '{invalid_value}' not {valid_list}"
+        error_info.update({
+            "error_type": "invalid_value",
+            "error_value": str(invalid_value),
+            "error_explanation": f"{field_designation} contains invalid value '{invalid_value}' not {valid_list}"
+        })
     
     return str(invalid_value)
     
 def invalid_character_generator(field_designation, field_spec, valid_value, error_info=None):
     """Generate invalid character error (characters not in allowed character set)."""
-    characterset = field_spec.get("characterset", "alphanumeric")
+    characterset = field_spec["characterset"]
         
-    # Load character sets
-    character_sets = load_character_sets()
-    
     # Get unsafe characters from predefined unsafe character sets
-    unsafe_charset_name = f"{characterset}_unsafe"
-    unsafe_chars = character_sets.get(unsafe_charset_name, "")
+    unsafe_chars = field_spec["unsafe_chars"]
     
     # Protection: if no unsafe chars defined or at extended level, use N/A
     if not unsafe_chars or characterset == "extended":
-        return {
-            "error_type": "invalid_character",
-            "error_value": "N/A",
-            "error_explanation": f"{field_designation} cannot generate invalid characters (at highest character set level)"
-        }
+        if error_info is not None:
+            error_info.update({
+                "error_type": "invalid_character",
+                "error_value": "N/A",
+                "error_explanation": f"{field_designation} cannot generate invalid characters (at highest character set level)"
+            })
+        return "N/A"
     
     # Use the provided valid_value as base and inject unsafe characters
     result = str(valid_value)
     target_length = len(result)
-    injected_chars = []
     
     # Add unsafe characters at random positions (heavily weight single character)
-    if random.random() < 0.8:  # 80% chance of single character
-        num_unsafe = 1
-    elif random.random() < 0.95:  # 15% chance of two characters  
-        num_unsafe = 2
-    else:  # 5% chance of three characters
-        num_unsafe = min(3, target_length)
-    for _ in range(num_unsafe):
-        pos = random.randint(0, target_length - 1)
-        injected_char = random.choice(unsafe_chars)
-        injected_chars.append(injected_char)
-        result = result[:pos] + injected_char + result[pos + 1:]
+    num_unsafe = random.choices(UNSAFE_COUNTS, cum_weights=UNSAFE_COUNT_CUM_WEIGHTS)[0]
+    # Distinct positions so no injected character overwrites another
+    positions = random.sample(range(target_length), min(num_unsafe, target_length))
+    injected_chars = random.choices(unsafe_chars, k=len(positions))
+    
+    # Overwrite positions in a character buffer instead of re-slicing the string
+    buffer = list(result)
+    for pos, injected_char in zip(positions, injected_chars):
+        buffer[pos] = injected_char
+    result = ''.join(buffer)
         
     # Update error_info if provided
     if error_info is not None:
-        error_info["error_type"] = "invalid_character"
-        error_info["error_value"] = result
         # Show which specific invalid characters were injected
-        chars_list = ", ".join(f"'{char}'" for char in set(injected_chars))
-        error_info["error_explanation"] = f"{field_designation} contains invalid characters: {chars_list}"
+        chars_list = ", ".join(f"'{char}'" for char in dict.fromkeys(injected_chars))
+        error_info.update({
+            "error_type": "invalid_character",
+            "error_value": result,
+            "error_explanation": f"{field_designation} contains invalid characters: {chars_list}"
+        })
     
     return result
 
 def invalid_length_generator(field_designation, field_spec, valid_value, error_info=None):
     """Generate wrong length error (value outside min/max length constraints)."""
-    min_length = field_spec.get("min_length", 1)
-    max_length = field_spec.get("max_length", min_length)
-    characterset = field_spec.get("characterset", "alphanumeric")
+    min_length = field_spec["min_length"]
+    max_length = field_spec["max_length"]
     
-    # Load character sets for adding valid characters
-    character_sets = load_character_sets()
-    safe_characterset = convert_to_safe_characterset(characterset)
-    allowed_chars = character_sets.get(safe_characterset, character_sets["alphanumeric"])
+    # Valid characters for padding the value out
+    allowed_chars = field_spec["allowed_chars"]
     
     # Use the provided valid_value as base
     result = str(valid_value)
@@ -290,74 +287,133 @@ def invalid_length_generator(field_designation, field_spec, valid_value, error_i
     # Determine if we should make it too short or too long
     if random.random() < 0.5 and min_length > 1:
         # Too short - remove characters from the end
-        target_length = random.randint(1, min_length - 1)
+        target_length = random.randrange(1, min_length)
         result = result[:target_length]
     else:
         # Too long - add valid characters to the end
-        target_length = max_length + random.randint(1, 5)
-        extra_chars = ''.join(random.choice(allowed_chars) for _ in range(target_length - current_length))
+        target_length = max_length + random.randrange(1, 6)
+        extra_chars = ''.join(random.choices(allowed_chars, k=target_length - current_length))
         result = result + extra_chars
     
     # Update error_info if provided
     if error_info is not None:
-        error_info["error_type"] = "invalid_length"
-        error_info["error_value"] = result
-        error_info["error_explanation"] = f"{field_designation} has wrong length {len(result)}, expected {min_length}-{max_length}"
+        error_info.update({
+            "error_type": "invalid_length",
+            "error_value": result,
+            "error_explanation": f"{field_designation} has wrong length {len(result)}, expected {min_length}-{max_length}"
+        })
     
     return result
 
 def all_zeros_generator(field_designation, field_spec, valid_value, error_info=None):
     """Generate all zeros error for numeric fields."""
-    min_length = field_spec.get("min_length", 1)
-    max_length = field_spec.get("max_length", min_length)
-    target_length = random.randint(min_length, max_length)
+    min_length = field_spec["min_length"]
+    max_length = field_spec["max_length"]
+    target_length = random_length(min_length, max_length)
     error_value = "0" * target_length
     
     # Update error_info if provided
     if error_info is not None:
-        error_info["error_type"] = "all_zeros"
-        error_info["error_value"] = error_value
-        error_info["error_explanation"] = f"{field_designation} contains all zeros, which is invalid"
+        error_info.update({
+            "error_type": "all_zeros",
+            "error_value": error_value,
+            "error_explanation": f"{field_designation} contains all zeros, which is invalid"
+        })
+    
+    return error_value
+
+def incorrect_control_number_generator(field_designation, field_spec, valid_value, error_info=None):
+    """Generate control number that doesn't match its paired control number (e.g. IEA02 vs ISA13)."""
+    max_length = field_spec["max_length"]
+    
+    # Protection: no width to generate a control number in
+    if max_length < 1:
+        if error_info is not None:
+            error_info.update({
+                "error_type": "incorrect_control_number",
+                "error_value": "N/A",
+                "error_explanation": f"{field_designation} cannot generate an incorrect control number (no field length)"
+            })
+        return "N/A"
+    
+    modulus = 10 ** max_length
+    if valid_value.isdigit():
+        # Shift by a non-zero offset so the result always differs - no resample loop needed
+        offset = random.randrange(1, modulus)
+        error_value = f"{(int(valid_value) + offset) % modulus:0{max_length}d}"
+    else:
+        # Any all-digit value differs from a non-numeric one
+        error_value = f"{random.randrange(modulus):0{max_length}d}"
+    
+    # Update error_info if provided
+    if error_info is not None:
+        error_info.update({
+            "error_type": "incorrect_control_number",
+            "error_value": error_value,
+            "error_explanation": f"{field_designation} control number {error_value} doesn't match expected {valid_value}"
+        })
     
     return error_value
 
 # Helper functions
-def random_string_generator(characterset, min_length, max_length):
-    """Helper function to generate random strings with character set constraints."""
-    character_sets = load_character_sets()
-    safe_characterset = convert_to_safe_characterset(characterset)
-    chars = character_sets.get(safe_characterset, character_sets["alphanumeric"])
-    
-    target_length = random.randint(min_length, max_length)
-    return ''.join(random.choice(chars) for _ in range(target_length))
-
-def convert_to_safe_characterset(characterset):
-    """Convert character set to safe version (removes EDI delimiters)."""
-    safe_mapping = {
-        "printable": "printable_safe",
-        "extended": "extended_safe",
-    }
-    return safe_mapping.get(characterset, characterset)
+def random_length(min_length, max_length):
+    """Pick a length in [min_length, max_length], skipping the draw for fixed-width fields."""
+    if min_length == max_length:
+        return min_length
+    return random.randrange(min_length, max_length + 1)
+
+def random_string_excluding(chars, min_length, max_length, excluded_values):
+    """
+    Generate a random string from chars that is not one of excluded_values.
+    
+    Draws once; on a collision, changes a single character so the result is
+    no longer excluded, then falls back to searching every allowed length.
+    Returns None only if every string of every allowed length is excluded.
+    """
+    target_length = random_length(min_length, max_length)
+    value = ''.join(random.choices(chars, k=target_length))
+    if value not in excluded_values:
+        return value
+    
+    excluded_values = set(excluded_values)
+    for pos in random.sample(range(target_length), target_length):
+        candidates = [value[:pos] + char + value[pos + 1:] for char in chars]
+        candidates = [candidate for candidate in candidates if candidate not in excluded_values]
+        if candidates:
+            return random.choice(candidates)
+    
+    # Every neighbour is excluded too - walk each length in a shuffled order.
+    # Each walk stops within len(excluded_values) + 1 steps, so this is bounded.
+    shuffled_chars = random.sample(chars, len(chars))
+    lengths = range(min_length, max_length + 1)
+    for length in random.sample(lengths, len(lengths)):
+        for candidate in map(''.join, product(shuffled_chars, repeat=length)):
+            if candidate not in excluded_values:
+                return candidate
+    return None
+
+def smart_join(items, final_joiner=" or "):
+    """Join items with commas, using final_joiner before the last item."""
+    quoted = [f"'{item}'" for item in items]
+    if len(quoted) <= 1:
+        return "".join(quoted)
+    return ", ".join(quoted[:-1]) + final_joiner + quoted[-1]
+
+def get_allowed_chars(characterset):
+    """Get the safe characters a field of this character set may contain."""
+    return ALLOWED_CHARS.get(characterset, ALLOWED_CHARS["alphanumeric"])
+
+def get_unsafe_chars(characterset):
+    """Get the characters that are invalid for this character set."""
+    return UNSAFE_CHARS.get(characterset, "")
 
 def convert_error_weight_to_rate(error_weight):
     """Convert semantic error weight to numeric error rate."""
-    weight_mapping = {
-        "very_common": 0.3,  # 30% chance of error
-        "common": 0.1,       # 10% chance of error
-        "rare": 0.02,        # 2% chance of error
-        "never": 0.0         # 0% chance of error
-    }
-    return weight_mapping.get(error_weight, 0.02)  # Default to rare
+    return ERROR_WEIGHT_RATES.get(error_weight, 0.02)  # Default to rare
 
 def pick_random_field_for_error(segment_name):
     """Pick a random field from YAML specs for the given segment."""
-    field_specs = load_field_specs()
-    
-    # Get all fields for this segment from nested structure
-    segment_fields = []
-    if segment_name in field_specs and 'fields' in field_specs[segment_name]:
-        segment_fields = list(field_specs[segment_name]['fields'].keys())
-    
+    segment_fields = SEGMENT_FIELDS.get(segment_name)
     if not segment_fields:
         return None
     
@@ -372,13 +428,17 @@ def structural_error_generator(error_type="fallback", field_values=None, error_i
     # Update error_info if provided (like field error generators)
     if error_info is not None:
         if error_type == "fallback":
-            error_info["error_type"] = "missing_segment"
-            error_info["error_value"] = ""  # Empty string = missing segment
-            error_info["error_explanation"] = "Segment is missing (structural error fallback)"
+            error_info.update({
+                "error_type": "missing_segment",
+                "error_value": "",  # Empty string = missing segment
+                "error_explanation": "Segment is missing (structural error fallback)"
+            })
         else:
-            error_info["error_type"] = "missing_segment"
-            error_info["error_value"] = ""  # Empty string = missing segment
-            error_info["error_explanation"] = f"Structural error: {error_type} (implementation pending - fallback to missing segment)"
+            error_info.update({
+                "error_type": "missing_segment",
+                "error_value": "",  # Empty string = missing segment
+                "error_explanation": f"Structural error: {error_type} (implementation pending - fallback to missing segment)"
+            })
     
     # TODO: Implement actual structural error modifications:
     # - wrong_delimiter: Replace all "*" with "|" or other delimiters
@@ -397,8 +457,19 @@ def is_error_in_field(field_designation, error_info):
     return (error_info.get("error_target") == "FIELD" and 
             error_info.get("error_field") == field_designation)
 
+# Error type -> generator dispatch table, shared by every field-level caller
+FIELD_ERROR_GENERATORS = {
+    "blank_value": blank_value_generator,
+    "missing_value": missing_value_generator,
+    "invalid_value": invalid_value_generator,
+    "invalid_character": invalid_character_generator,
+    "invalid_length": invalid_length_generator,
+    "all_zeros": all_zeros_generator,
+    "incorrect_control_number": incorrect_control_number_generator,
+}
+
 # Main error generation function
-def field_error_generator(field_designation, field_spec, valid_value):
+def field_error_generator(field_designation, field_spec, valid_value, error_info=None):
     """
     Generate field-level errors based on YAML specifications.
     
@@ -406,40 +477,45 @@ def field_error_generator(field_designation, field_spec, valid_value):
         field_designation: Field identifier (e.g., "ISA01")
         field_spec: Field specification from YAML
         valid_value: Current valid value for the field
+        error_info: Shared state dict - gets updated with error details (error_type, error_value, error_explanation)
     
     Returns:
-        dict: Error information with type, value, and explanation
+        str: The error value (or the valid value when no error scenarios are defined)
     """
-    error_scenarios = field_spec.get("error_scenarios", [])
+    error_scenarios = field_spec["error_scenarios"]
     
     if not error_scenarios:
-        # No error scenarios defined, return valid value
-        return {
-            "error_type": "none",
-            "error_value": valid_value,
-            "error_explanation": f"No error scenarios defined for {field_designation}"
-        }
+        # No error scenarios defined, keep valid value
+        if error_info is not None:
+            error_info.update({
+                "error_type": "none",
+                "error_value": valid_value,
+                "error_explanation": f"No error scenarios defined for {field_designation}"
+            })
+        return valid_value
     
     # Choose random error scenario
     error_type = random.choice(error_scenarios)
     
-    # Route to appropriate generator
-    generator_map = {
-        "blank_value": blank_value_generator,
-        "missing_value": missing_value_generator,
-        "invalid_value": invalid_value_generator,
-        "invalid_character": invalid_character_generator,
-        "invalid_length": invalid_length_generator,
-        "all_zeros": all_zeros_generator,
-    }
-    
-    generator = generator_map.get(error_type)
+    # Route to appropriate generator - they update error_info directly
+    generator = FIELD_ERROR_GENERATORS.get(error_type)
     if generator:
-        return generator(field_designation, field_spec, valid_value)
-    else:
-        # Fallback for unimplemented error types
-        return {
+        return generator(field_designation, field_spec, valid_value, error_info)
+    
+    # Fallback for unimplemented error types
+    if error_info is not None:
+        error_info.update({
             "error_type": "fallback",
             "error_value": "N/A",
             "error_explanation": f"Error type '{error_type}' not implemented for {field_designation}"
-        }
\ No newline at end of file
+        })
+    return "N/A"
+
+# Bound once at import, after the parsing helpers above are defined
+FIELD_SPECS = load_field_specs()
+
+# Field IDs per segment, so random field picks skip rebuilding a key list
+SEGMENT_FIELDS = {
+    segment_name: tuple(segment_data.get('fields', {}))
+    for segment_name, segment_data in FIELD_SPECS.items()
+}
@@ -48,23 +48,21 @@ def generate_action_code():
     """Generate BGN08 - Action Code."""
     return "00"
 
+# Static BGN segment built once from the field generators above
+BGN_SEGMENT = "BGN*" + "*".join([
+    generate_transaction_purpose_code(),
+    generate_reference_identification(),
+    generate_transaction_date(),
+    generate_transaction_time(),
+    generate_time_zone_code(),
+    generate_additional_reference(),
+    generate_transaction_type_code(),
+    generate_action_code()
+]) + "~"
+
 def generate_bgn_segment(error_info=None):
     """Generate BGN segment - Beginning Segment."""
-    field_values = [
-        generate_transaction_purpose_code(),
-        generate_reference_identification(),
-        generate_transaction_date(),
-        generate_transaction_time(),
-        generate_time_zone_code(),
-        generate_additional_reference(),
-        generate_transaction_type_code(),
-        generate_action_code()
-    ]
-    
-    # Build BGN segment string
-    bgn_segment = f"BGN*{'*'.join(field_values)}~"
-    
-    return bgn_segment
+    return BGN_SEGMENT
 
 #=============================================================================
 # N1 SEGMENT
@@ -86,19 +84,17 @@ def generate_identification_code():
     """Generate N104 - Identification Code."""
     return "123456789"
 
+# Static N1 segment built once from the field generators above
+N1_SEGMENT = "N1*" + "*".join([
+    generate_entity_identifier_code(),
+    generate_entity_name(),
+    generate_identification_code_qualifier(),
+    generate_identification_code()
+]) + "~"
+
 def generate_n1_segment(error_info=None):
     """Generate N1 segment - Name Segment."""
-    field_values = [
-        generate_entity_identifier_code(),
-        generate_entity_name(),
-        generate_identification_code_qualifier(),
-        generate_identification_code()
-    ]
-    
-    # Build N1 segment string
-    n1_segment = f"N1*{'*'.join(field_values)}~"
-    
-    return n1_segment
+    return N1_SEGMENT
 
 #=============================================================================
 # REF SEGMENT
@@ -112,17 +108,15 @@ def generate_reference_identification_value():
     """Generate REF02 - Reference Identification."""
     return "POL123456"
 
+# Static REF segment built once from the field generators above
+REF_SEGMENT = "REF*" + "*".join([
+    generate_reference_identification_qualifier(),
+    generate_reference_identification_value()
+]) + "~"
+
 def generate_ref_segment(error_info=None):
     """Generate REF segment - Reference Information Segment."""
-    field_values = [
-        generate_reference_identification_qualifier(),
-        generate_reference_identification_value()
-    ]
-    
-    # Build REF segment string
-    ref_segment = f"REF*{'*'.join(field_values)}~"
-    
-    return ref_segment
+    return REF_SEGMENT
 
 #=============================================================================
 # DTP SEGMENT
@@ -140,18 +134,16 @@ def generate_date_time_period():
     """Generate DTP03 - Date/Time Period."""
     return "20250117"
 
+# Static DTP segment built once from the field generators above
+DTP_SEGMENT = "DTP*" + "*".join([
+    generate_date_time_qualifier(),
+    generate_date_time_period_format_qualifier(),
+    generate_date_time_period()
+]) + "~"
+
 def generate_dtp_segment(error_info=None):
     """Generate DTP segment - Date/Time/Period Segment."""
-    field_values = [
-        generate_date_time_qualifier(),
-        generate_date_time_period_format_qualifier(),
-        generate_date_time_period()
-    ]
-    
-    # Build DTP segment string
-    dtp_segment = f"DTP*{'*'.join(field_values)}~"
-    
-    return dtp_segment
+    return DTP_SEGMENT
 
 #=============================================================================
 # HEADER DATA GENERATION
@@ -160,10 +152,10 @@ def generate_dtp_segment(error_info=None):
 def generate_header_data(error_info=None):
     """Generate all header segments."""
     return {
-        "bgn": [generate_bgn_segment(error_info=error_info)],
-        "n1": [generate_n1_segment(error_info=error_info)],
-        "ref": [generate_ref_segment(error_info=error_info)],
-        "dtp": [generate_dtp_segment(error_info=error_info)]
+        "bgn": [BGN_SEGMENT],
+        "n1": [N1_SEGMENT],
+        "ref": [REF_SEGMENT],
+        "dtp": [DTP_SEGMENT]
     }
 
 """
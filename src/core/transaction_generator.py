@@ -7,16 +7,38 @@ Builds full transactions using segment generators.
 
 import random
 import yaml
-from pathlib import Path
 from .envelope_segment_generator import generate_envelope_data
 from .header_segment_generator import generate_header_data
 from .member_segment_generator import generate_member_data
 from .coverage_segment_generator import generate_coverage_data
+from .error_generator import pick_random_field_for_error
+from .data_generator import DATA_DIR, load_yaml_file
+
+# Error target selection - 20% structural (SEGMENT), 80% field-level (FIELD)
+ERROR_TARGETS = ("SEGMENT", "FIELD")
+ERROR_TARGET_CUM_WEIGHTS = (20, 100)
+
+# Repeat counts per segment type in each transaction set - (counts, cumulative weights)
+SEGMENT_COUNT_WEIGHTS = {
+    "ref": ((0, 1, 2), (60, 90, 100)),
+    "dtp": ((0, 1, 2, 3), (50, 80, 95, 100)),
+    "per": ((0, 1, 2), (60, 90, 100)),
+    "n3": ((0, 1), (20, 100)),
+    "n4": ((0, 1), (20, 100)),
+    "dmg": ((0, 1), (30, 100)),
+    "hd": ((1, 2, 3), (60, 90, 100)),
+    "hd_dtp": ((1, 2, 3), (40, 80, 100)),
+    "cob": ((0, 1), (80, 100)),
+}
+
+def pick_segment_counts(segment_type, k):
+    """Draw how many repeats of a segment type to include, for k occurrences at once."""
+    counts, cum_weights = SEGMENT_COUNT_WEIGHTS[segment_type]
+    return random.choices(counts, cum_weights=cum_weights, k=k)
 
 
 def load_segment_list(verbose=False):
     """Load authoritative list of segments from all YAML specification files."""
-    data_dir = Path(__file__).parent.parent / "data"
     yaml_files = [
         "envelope_segment_specifications.yaml",
         "header_segment_specifications.yaml",
@@ -26,12 +48,11 @@ def load_segment_list(verbose=False):
     
     segment_list = []
     for yaml_file in yaml_files:
-        yaml_path = data_dir / yaml_file
+        yaml_path = DATA_DIR / yaml_file
         
         if yaml_path.exists():
             try:
-                with open(yaml_path, 'r') as f:
-                    data = yaml.safe_load(f)
+                data = load_yaml_file(yaml_path)
                     
                 if data and 'segments' in data:
                     segments = list(data['segments'].keys())
@@ -53,6 +74,9 @@ def load_segment_list(verbose=False):
         print(f"Total segments loaded: {len(segment_list)}")
     return segment_list
 
+# Segment list loaded once at import - the spec files do not change during a run
+SEGMENT_LIST = load_segment_list()
+
 def generate_834_transaction(error_rate=0.0, count=1):
     """
     Generate a complete EDI 834 transaction.
@@ -65,9 +89,8 @@ def generate_834_transaction(error_rate=0.0, count=1):
         dict: Contains transaction string and error_info
     """
 
-    # Load authoritative segment list from YAML files
-    segment_list = load_segment_list()
-
+    # Authoritative segment list, loaded from the YAML files at import
+    segment_list = SEGMENT_LIST
     
     # Shared error state dictionary - passed by reference through call chain 
     # With error value returned by error generators at the end of the chain
@@ -83,7 +106,7 @@ def generate_834_transaction(error_rate=0.0, count=1):
     # Determine if error occurs
     if random.random() < error_rate:
         # Generate error info for injection
-        error_info["error_target"] = random.choices(["SEGMENT", "FIELD"], weights=[20, 80])[0]
+        error_info["error_target"] = random.choices(ERROR_TARGETS, cum_weights=ERROR_TARGET_CUM_WEIGHTS)[0]
         
         # Pick a random segment to target
         if segment_list:
@@ -91,14 +114,9 @@ def generate_834_transaction(error_rate=0.0, count=1):
             
             # If field error, discover all fields for that specific segment
             if error_info["error_target"] == "FIELD":
-                from .envelope_segment_generator import load_field_specs
-                field_specs = load_field_specs()
-                
-                segment_name = error_info["error_segment"]
-                if segment_name in field_specs and 'fields' in field_specs[segment_name]:
-                    segment_fields = list(field_specs[segment_name]['fields'].keys())
-                    if segment_fields:
-                        error_info["error_field"] = random.choice(segment_fields)
+                error_field = pick_random_field_for_error(error_info["error_segment"])
+                if error_field:
+                    error_info["error_field"] = error_field
     
     # PHASE 1: GENERATE - Generate all segment data
     envelope_data = generate_envelope_data(error_info)
@@ -125,6 +143,16 @@ def generate_834_transaction(error_rate=0.0, count=1):
     segments.extend(envelope_data["isa"])
     segments.extend(envelope_data["gs"])
     
+    # Draw every loop's repeat counts up front - one random.choices call per segment type
+    ref_counts = pick_segment_counts("ref", count)
+    dtp_counts = pick_segment_counts("dtp", count)
+    per_counts = pick_segment_counts("per", count)
+    n3_counts = pick_segment_counts("n3", count)
+    n4_counts = pick_segment_counts("n4", count)
+    dmg_counts = pick_segment_counts("dmg", count)
+    hd_counts = pick_segment_counts("hd", count)
+    cob_counts = pick_segment_counts("cob", count)
+    
     # Transaction sets (ST/SE loops)
     for i in range(count):
         segments.extend(envelope_data["st"])
@@ -139,44 +167,43 @@ def generate_834_transaction(error_rate=0.0, count=1):
         
         # Additional REF segments (e.g. Subscriber ID, Group Number, Policy Number)
         # Note: First REF segment already added from header_data above
-        ref_count = random.choices([0, 1, 2], weights=[60, 30, 10])[0]
+        ref_count = ref_counts[i]
         if ref_count > 0:
             segments.extend(coverage_data["ref_segments"][:ref_count])
         
         # Additional DTP segments (e.g. Eligibility Date, Coverage Begin/End)
         # Note: First DTP segment already added from header_data above
-        dtp_count = random.choices([0, 1, 2, 3], weights=[50, 30, 15, 5])[0]
+        dtp_count = dtp_counts[i]
         if dtp_count > 0:
             segments.extend(coverage_data["dtp_segments"][:dtp_count])
         
         segments.extend(member_data["nm1"])
         
         # PER segments (contact information)
-        per_count = random.choices([0, 1, 2], weights=[60, 30, 10])[0]
+        per_count = per_counts[i]
         segments.extend(member_data["per_segments"][:per_count])
         
         # N3 segments (address information)
-        n3_count = random.choices([0, 1], weights=[20, 80])[0]
+        n3_count = n3_counts[i]
         segments.extend(member_data["n3_segments"][:n3_count])
         
         # N4 segments (geographic location)
-        n4_count = random.choices([0, 1], weights=[20, 80])[0]
+        n4_count = n4_counts[i]
         segments.extend(member_data["n4_segments"][:n4_count])
         
         # DMG segments (demographic information)
-        dmg_count = random.choices([0, 1], weights=[30, 70])[0]
+        dmg_count = dmg_counts[i]
         segments.extend(member_data["dmg_segments"][:dmg_count])
         
         # HD segments (e.g. Health, Dental, Vision, Pet coverage)
-        hd_count = random.choices([1, 2, 3], weights=[60, 30, 10])[0]
+        hd_count = hd_counts[i]
         segments.extend(coverage_data["hd_segments"][:hd_count])
         # Each HD segment typically has multiple DTP segments (Coverage Begin, End, etc.)
-        for j in range(hd_count):
-            hd_dtp_count = random.choices([1, 2, 3], weights=[40, 40, 20])[0]
+        for hd_dtp_count in pick_segment_counts("hd_dtp", hd_count):
             segments.extend(coverage_data["dtp_segments"][:hd_dtp_count])
         
         # COB segments (coordination of benefits)
-        cob_count = random.choices([0, 1], weights=[80, 20])[0]
+        cob_count = cob_counts[i]
         segments.extend(coverage_data["cob"][:cob_count])
         
         segments.extend(envelope_data["se"])
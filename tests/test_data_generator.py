@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test Data Generator
+
+Tests the YAML loader's on-disk pickle cache: fresh, stale, corrupt and
+unwritable caches must all still return the parsed YAML.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add src to path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core import data_generator
+from core.data_generator import load_yaml_file
+
+def load_with_cache_dir(yaml_path, cache_dir):
+    """Load yaml_path with the pickle cache pointed at cache_dir."""
+    original_cache_dir = data_generator.YAML_CACHE_DIR
+    data_generator.YAML_CACHE_DIR = cache_dir
+    try:
+        return load_yaml_file(yaml_path)
+    finally:
+        data_generator.YAML_CACHE_DIR = original_cache_dir
+
+def test_yaml_cache_roundtrip():
+    """Test that the first load writes the cache and the second load reuses it."""
+    print("Testing YAML cache round trip...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yaml_path = Path(temp_dir) / "specs.yaml"
+        yaml_path.write_text("fields:\n  ISA01: alpha\n")
+        cache_dir = Path(temp_dir) / ".cache"
+
+        first = load_with_cache_dir(yaml_path, cache_dir)
+        assert (cache_dir / "specs.yaml.pkl").exists(), "First load should write the pickle cache"
+
+        second = load_with_cache_dir(yaml_path, cache_dir)
+        assert first == second == {"fields": {"ISA01": "alpha"}}, f"Cached load should match parse, got: {second}"
+
+    print("✅ YAML cache round trip works")
+
+def test_stale_yaml_cache():
+    """Test that editing the YAML file invalidates the cached copy."""
+    print("Testing stale YAML cache...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yaml_path = Path(temp_dir) / "specs.yaml"
+        yaml_path.write_text("fields:\n  ISA01: alpha\n")
+        cache_dir = Path(temp_dir) / ".cache"
+        load_with_cache_dir(yaml_path, cache_dir)
+
+        yaml_path.write_text("fields:\n  ISA01: numeric\n")
+        data = load_with_cache_dir(yaml_path, cache_dir)
+        assert data == {"fields": {"ISA01": "numeric"}}, f"Stale cache should be reparsed, got: {data}"
+
+    print("✅ Stale YAML cache is reparsed")
+
+def test_corrupt_yaml_cache():
+    """Test that a corrupt pickle falls back to parsing instead of raising."""
+    print("Testing corrupt YAML cache...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yaml_path = Path(temp_dir) / "specs.yaml"
+        yaml_path.write_text("fields:\n  ISA01: alpha\n")
+        cache_dir = Path(temp_dir) / ".cache"
+        cache_dir.mkdir()
+
+        # Truncated data raises EOFError, a missing global raises AttributeError
+        for corrupt_pickle in (b"", b"\x80", b"cos\nno_such_attribute\n."):
+            (cache_dir / "specs.yaml.pkl").write_bytes(corrupt_pickle)
+            data = load_with_cache_dir(yaml_path, cache_dir)
+            assert data == {"fields": {"ISA01": "alpha"}}, f"Corrupt cache {corrupt_pickle!r} should be reparsed, got: {data}"
+
+    print("✅ Corrupt YAML cache is reparsed")
+
+def test_unwritable_yaml_cache():
+    """Test that an unwritable cache directory is skipped and leaves no temp files."""
+    print("Testing unwritable YAML cache...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yaml_path = Path(temp_dir) / "specs.yaml"
+        yaml_path.write_text("fields:\n  ISA01: alpha\n")
+
+        # A cache directory under a regular file can never be created
+        blocker = Path(temp_dir) / "blocker"
+        blocker.write_text("")
+        data = load_with_cache_dir(yaml_path, blocker / ".cache")
+        assert data == {"fields": {"ISA01": "alpha"}}, f"Unwritable cache should still load, got: {data}"
+
+        leftovers = [path.name for path in Path(temp_dir).rglob("*.tmp")]
+        assert not leftovers, f"Failed cache writes should not leave temp files: {leftovers}"
+
+    print("✅ Unwritable YAML cache is skipped")
+
+def main():
+    """Run all data generator tests."""
+    print("🧪 Testing Data Generator")
+    print("========================")
+
+    try:
+        test_yaml_cache_roundtrip()
+        test_stale_yaml_cache()
+        test_corrupt_yaml_cache()
+        test_unwritable_yaml_cache()
+
+        print("\n🎉 All data generator tests passed!")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n💥 Unexpected error: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit(main())
@@ -17,6 +17,7 @@ from core.envelope_segment_generator import (
     generate_iea_segment, 
     generate_envelope_data
 )
+from core.error_generator import FIELD_SPECS, FIELD_ERROR_GENERATORS
 
 def test_isa_segment_structure():
     """Test that ISA segment has correct structure (16 fields)."""
@@ -88,6 +89,53 @@ def test_control_number_matching():
     print(f"✅ Control numbers match: ISA13={isa13}, IEA02={iea02}")
     return isa13, iea02
 
+def test_incorrect_control_number():
+    """Test that an incorrect_control_number error makes IEA02 differ from ISA13."""
+    print("Testing incorrect control number error...")
+    
+    # Target IEA02 until its error scenario draws incorrect_control_number
+    for _ in range(500):
+        error_info = {"error_target": "FIELD", "error_field": "IEA02"}
+        envelope_data = generate_envelope_data(error_info)
+        if error_info.get("error_type") == "incorrect_control_number":
+            break
+    assert error_info.get("error_type") == "incorrect_control_number", f"IEA02 never drew incorrect_control_number: {error_info}"
+    
+    isa13 = envelope_data["isa"][0].split("*")[13]
+    iea02 = envelope_data["iea"][0].split("*")[2].rstrip("~")
+    
+    assert iea02 != isa13, f"IEA02 ({iea02}) should differ from ISA13 ({isa13})"
+    assert len(iea02) == 9, f"IEA02 should stay 9 digits, got: {len(iea02)}"
+    assert iea02.isdigit(), f"IEA02 should stay numeric, got: {iea02}"
+    assert error_info["error_value"] == iea02, f"error_info should record IEA02, got: {error_info}"
+    
+    # Non-numeric control numbers still produce a 9-digit mismatch
+    generator = FIELD_ERROR_GENERATORS["incorrect_control_number"]
+    field_spec = FIELD_SPECS["IEA"]["fields"]["IEA02"]
+    for valid_value in ("", "N/A", "000000000", "999999999"):
+        error_value = generator("IEA02", field_spec, valid_value)
+        assert error_value != valid_value, f"Error value should differ from {valid_value!r}"
+        assert len(error_value) == 9 and error_value.isdigit(), f"Error value should be 9 digits, got: {error_value!r}"
+    
+    print(f"✅ Incorrect control number: ISA13={isa13}, IEA02={iea02}")
+
+def test_unimplemented_error_type():
+    """Test that an error type with no generator still reports the drawn type."""
+    print("Testing unimplemented error type reporting...")
+    
+    # ISA09 scenarios are invalid_date, blank_value and missing_value
+    error_scenarios = FIELD_SPECS["ISA"]["fields"]["ISA09"]["error_scenarios"]
+    seen_types = set()
+    for _ in range(300):
+        error_info = {"error_target": "FIELD", "error_field": "ISA09"}
+        generate_envelope_data(error_info)
+        assert error_info["error_type"] in error_scenarios, f"ISA09 error type should be one of {error_scenarios}, got: {error_info}"
+        seen_types.add(error_info["error_type"])
+    
+    assert "invalid_date" in seen_types, f"ISA09 never reported invalid_date: {seen_types}"
+    
+    print(f"✅ Unimplemented error types keep their name: {sorted(seen_types)}")
+
 def test_field_values():
     """Test that specific field values are generated correctly."""
     print("Testing field value generation...")
@@ -178,6 +226,8 @@ def main():
         test_isa_segment_structure()
         test_iea_segment_structure()
         test_control_number_matching()
+        test_incorrect_control_number()
+        test_unimplemented_error_type()
         test_field_values()
         test_edi_delimiter_safety()
         test_multiple_generations()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test Error Generator
+
+Tests invalid value generation when most or all candidate values are
+already valid, so the first random draw is likely to collide.
+"""
+
+import sys
+import os
+
+# Add src to path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.error_generator import random_string_excluding, invalid_value_generator
+
+DIGITS = "0123456789"
+
+def test_excluding_after_collision():
+    """Test that a colliding first draw still returns a non-excluded value."""
+    print("Testing random_string_excluding after a collision...")
+
+    # Nine of ten digits are valid, so the first draw collides 90% of the time
+    valid_values = list("012345678")
+    for _ in range(200):
+        value = random_string_excluding(DIGITS, 1, 1, valid_values)
+        assert value == "9", f"Only '9' is outside valid_values, got: {value!r}"
+
+    # Every single-character change of "00" is valid, but "11" is not
+    valid_values = ["00", "01", "10"]
+    for _ in range(200):
+        value = random_string_excluding("01", 2, 2, valid_values)
+        assert value == "11", f"Only '11' is outside valid_values, got: {value!r}"
+
+    # Variable length: every 1-char value is valid, so a 2-char value must come back
+    valid_values = list(DIGITS)
+    for _ in range(200):
+        value = random_string_excluding(DIGITS, 1, 2, valid_values)
+        assert value not in valid_values, f"Value should not be valid, got: {value!r}"
+        assert len(value) == 2, f"Only 2-char values remain, got: {value!r}"
+
+    print("✅ Collisions resolve to non-excluded values")
+
+def test_excluding_when_everything_excluded():
+    """Test that None comes back only when every value is excluded."""
+    print("Testing random_string_excluding with everything excluded...")
+
+    assert random_string_excluding(DIGITS, 1, 1, list(DIGITS)) is None, "All 1-digit values are excluded"
+    assert random_string_excluding("01", 2, 2, ["00", "01", "10", "11"]) is None, "All 2-bit values are excluded"
+
+    print("✅ None only when every value is excluded")
+
+def test_invalid_value_fallback():
+    """Test that invalid_value_generator reports 'N/A' only when nothing is invalid."""
+    print("Testing invalid_value_generator fallback...")
+
+    field_spec = {
+        "common_errors": [],
+        "valid_values": list("012345678"),
+        "min_length": 1,
+        "max_length": 1,
+        "allowed_chars": DIGITS,
+        "valid_list": "",
+    }
+    for _ in range(100):
+        error_info = {}
+        value = invalid_value_generator("TEST01", field_spec, "0", error_info)
+        assert value == "9", f"Only '9' is invalid, got: {value!r}"
+        assert error_info["error_value"] == "9", f"error_info should record '9', got: {error_info}"
+
+    field_spec["valid_values"] = list(DIGITS)
+    value = invalid_value_generator("TEST01", field_spec, "0")
+    assert value == "N/A", f"Every digit is valid, expected 'N/A', got: {value!r}"
+
+    print("✅ invalid_value_generator falls back only when needed")
+
+def main():
+    """Run all error generator tests."""
+    print("🧪 Testing Error Generator")
+    print("=========================")
+
+    try:
+        test_excluding_after_collision()
+        test_excluding_when_everything_excluded()
+        test_invalid_value_fallback()
+
+        print("\n🎉 All error generator tests passed!")
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n💥 Unexpected error: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit(main())